@@ -1,10 +1,19 @@
-import mysql.connector
 import streamlit as st
-import pandas as pd
-from datetime import datetime, date
-from st_aggrid import AgGrid, GridOptionsBuilder
-import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime, date, timedelta
+from decimal import Decimal
 import json
+import numbers
+import os
+import struct
+import threading
+import time
+import zlib
+
+# pandas, mysql.connector and st_aggrid are imported inside the functions that
+# use them so that the script, which Streamlit re-runs on every interaction,
+# can paint the page before paying for the heavy imports.
 
 st.set_page_config(layout="wide", page_title="Steam Games Management", page_icon="🎮")
 
@@ -23,69 +32,252 @@ COLUMN_RENAME_MAP = {
     "genres": "Genres",
 }
 
-LOG_FILE = "recovery_log.txt"  # Log file path (still in the current working directory)
+LOG_FILE = "recovery_log.bin"  # Log file path (still in the current working directory)
 REPLICATION_LAG = 15  # Simulate replication lag (seconds)
 
-def create_connection(connection_key):
+# Connection keys defined in secrets.toml for each node
+NODE_CONNECTION_KEYS = {
+    "Node 1": "node_1",
+    "Node 2": "node_2",
+    "Node 3": "node_3",
+}
+
+def connection_settings(connection_key):
     # Retrieve the connection details from secrets.toml
-    host = st.secrets[connection_key]["host"]
-    port = st.secrets[connection_key]["port"]
-    user = st.secrets[connection_key]["username"]
-    password = st.secrets[connection_key]["password"]
-    database = st.secrets[connection_key]["database"]
-
-    conn = mysql.connector.connect(
-        host=host,
-        port=port,
-        user=user,
-        password=password,
-        database=database
-    )
+    return {
+        "host": st.secrets[connection_key]["host"],
+        "port": st.secrets[connection_key]["port"],
+        "user": st.secrets[connection_key]["username"],
+        "password": st.secrets[connection_key]["password"],
+        "database": st.secrets[connection_key]["database"],
+    }
+
+def create_connection(connection_key):
+    import mysql.connector
+
+    conn = mysql.connector.connect(connection_timeout=CONNECT_TIMEOUT, **connection_settings(connection_key))
     return conn
 
-# Create connections using the keys defined in secrets.toml
-conn1 = create_connection("node_1")
-conn2 = create_connection("node_2")
-conn3 = create_connection("node_3")
-conn1_cursor = conn1.cursor()
-conn2_cursor = conn2.cursor()
-conn3_cursor = conn3.cursor()
+# Connections are opened on first use and kept per session: mysql-connector
+# connections are not thread-safe and every Streamlit session runs in its own thread.
+# A connection opened before the node's circuit last opened is replaced on checkout.
+def get_connection(node):
+    connections = st.session_state.setdefault("connections", {})
+    generation = get_health_monitor().generation(node)
+    if node in connections and connections[node][1] != generation:
+        drop_connection(node)
+    if node not in connections:
+        try:
+            connections[node] = (create_connection(NODE_CONNECTION_KEYS[node]), generation)
+        except Exception:
+            get_health_monitor().report_failure(node)
+            raise
+    return connections[node][0]
+
+def drop_connection(node):
+    # Forget a broken connection so the next checkout opens a fresh one
+    conn, _ = st.session_state.get("connections", {}).pop(node, (None, None))
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+class NodeCursor:
+    """Buffered cursor for a single operation on a node's session connection.
 
-# Function to check if a connection is working
-def is_connection_active(conn):
-    try:
-        conn.ping()  # Try to ping the connection to check if it's alive
-        return True
-    except Exception:
-        return False
+    A connection error is retried once on a fresh connection, since the
+    server may simply have closed an idle session connection. Only a second
+    failure opens the node's circuit.
+    """
+
+    def __init__(self, node):
+        self.node = node
+        self._cursor = get_connection(node).cursor(buffered=True)
+
+    def execute(self, query, params=()):
+        import mysql.connector
+
+        connection_errors = (mysql.connector.InterfaceError, mysql.connector.OperationalError)
+        try:
+            self._cursor.execute(query, params)
+            return
+        except connection_errors:
+            drop_connection(self.node)
+
+        try:
+            self._cursor = get_connection(self.node).cursor(buffered=True)
+            self._cursor.execute(query, params)
+        except connection_errors:
+            get_health_monitor().report_failure(self.node)
+            drop_connection(self.node)
+            raise
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+def get_cursor(node):
+    return NodeCursor(node)
+
+# Failure detection
+HEARTBEAT_INTERVAL = 1.0  # Seconds between heartbeats to each node
+HEARTBEAT_TIMEOUT = 3.0  # A node is suspected after this long without a successful heartbeat
+CONNECT_TIMEOUT = 2  # Connect timeout (seconds) for request and heartbeat connections
+BREAKER_COOLDOWN = 10.0  # Seconds an open circuit waits before a half-open probe
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half-open"
+
+class FailureDetector:
+    """Missed-heartbeat failure detector for a single node."""
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        # Start out trusting the node; it is suspected once `timeout` passes without a heartbeat
+        self.last_heartbeat = time.monotonic()
+
+    def heartbeat(self, now):
+        self.last_heartbeat = now
+
+    def is_suspected(self, now):
+        return now - self.last_heartbeat > self.timeout
+
+class CircuitBreaker:
+    """Circuit breaker guarding requests to a single node.
+
+    Requests are only allowed while the circuit is closed. Once open, the
+    circuit moves to half-open after `cooldown` seconds and the next
+    heartbeat decides whether it closes again or re-opens.
+    """
+
+    def __init__(self, cooldown):
+        self.cooldown = cooldown
+        self.state = CIRCUIT_CLOSED
+        self.opened_at = 0.0
+        self.generation = 0  # Counts failures; connections from an older generation are stale
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        with self._lock:
+            return self.state == CIRCUIT_CLOSED
+
+    def try_half_open(self, now):
+        with self._lock:
+            if self.state == CIRCUIT_OPEN and now - self.opened_at >= self.cooldown:
+                self.state = CIRCUIT_HALF_OPEN
+
+    def record_success(self):
+        with self._lock:
+            self.state = CIRCUIT_CLOSED
+
+    def record_failure(self, now):
+        with self._lock:
+            self.state = CIRCUIT_OPEN
+            self.opened_at = now
+            self.generation += 1
+
+class HealthMonitor:
+    """Runs one heartbeat thread per node feeding its detector and breaker."""
+
+    def __init__(self, settings):
+        self.detectors = {node: FailureDetector(HEARTBEAT_TIMEOUT) for node in settings}
+        self.breakers = {node: CircuitBreaker(BREAKER_COOLDOWN) for node in settings}
+        for node, node_settings in settings.items():
+            threading.Thread(
+                target=self._watch, args=(node, node_settings), name=f"heartbeat-{node}", daemon=True
+            ).start()
+
+    def is_available(self, node):
+        return self.breakers[node].allow_request()
+
+    def state(self, node):
+        return self.breakers[node].state
+
+    def generation(self, node):
+        return self.breakers[node].generation
+
+    def report_failure(self, node):
+        # Request-path errors trip the circuit without waiting for the detector
+        self.breakers[node].record_failure(time.monotonic())
+
+    def _watch(self, node, node_settings):
+        import mysql.connector
+
+        detector = self.detectors[node]
+        breaker = self.breakers[node]
+        conn = None
+        while True:
+            breaker.try_half_open(time.monotonic())
+            try:
+                if conn is None:
+                    conn = mysql.connector.connect(connection_timeout=CONNECT_TIMEOUT, **node_settings)
+                conn.ping()
+                alive = True
+            except Exception:
+                alive = False
+                conn = None
+
+            now = time.monotonic()
+            if alive:
+                detector.heartbeat(now)
+            if breaker.state == CIRCUIT_HALF_OPEN:
+                # This heartbeat was the half-open probe
+                if alive:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure(now)
+            elif breaker.state == CIRCUIT_CLOSED and detector.is_suspected(now):
+                print(f"{node} missed heartbeats for {HEARTBEAT_TIMEOUT} seconds, opening its circuit.")
+                breaker.record_failure(now)
+            time.sleep(HEARTBEAT_INTERVAL)
+
+@st.cache_resource(show_spinner=False)
+def get_health_monitor():
+    return HealthMonitor({
+        node: connection_settings(connection_key)
+        for node, connection_key in NODE_CONNECTION_KEYS.items()
+    })
+
+# Function to check if a node is reachable. This only consults the node's
+# circuit breaker so that an outage never costs a connect timeout here.
+def is_connection_active(node):
+    return get_health_monitor().is_available(node)
     
 # Function to fetch data from a connection
 def fetch_data(conn, query):
+    import pandas as pd
+
     cursor = conn.cursor(dictionary=True)
     cursor.execute(query)
     result = cursor.fetchall()
     cursor.close()
     return pd.DataFrame(result)
 
-# Node Status
-node_status = {
-    "Node 1": True,
-    "Node 2": True,
-    "Node 3": True,
-}
+# Node Status: a node is usable when this session has not switched it off in the
+# sidebar (fault injection) and its circuit breaker is closed
+def node_available(node):
+    return st.session_state.get(f"node_enabled_{node}", True) and get_health_monitor().is_available(node)
 
 def fetch_data_with_fallback(query):
+    import pandas as pd
+
     # Try to fetch from Node 1
-    if is_connection_active(conn1):
-        df = fetch_data(conn1, query)
-    else:
+    df = None
+    if is_connection_active("Node 1"):
+        try:
+            df = fetch_data(get_connection("Node 1"), query)
+        except Exception:
+            # Open the circuit so later requests fail fast until a probe succeeds
+            get_health_monitor().report_failure("Node 1")
+    if df is None:
         # If Node 1 is down, use Node 2 or Node 3 based on the year partition
         print("Node 1 is down, using fallback...")
         
         # Attempt to get the release year to decide the partition node
         game_id = 1  # Example: you can specify a game_id to check its release year
-        cursor = conn2_cursor if is_connection_active(conn2) else conn3_cursor
-        conn = conn2 if is_connection_active(conn2) else conn3
+        fallback_node = "Node 2" if is_connection_active("Node 2") else "Node 3"
+        cursor = get_cursor(fallback_node)
         
         cursor.execute("SELECT release_date FROM games WHERE game_id = %s", (game_id,))
         result = cursor.fetchone()
@@ -94,27 +286,264 @@ def fetch_data_with_fallback(query):
             year = result[0].year
             if year <= 2010:
                 print("Using Node 2")
-                df = fetch_data(conn2, query)
+                df = fetch_data(get_connection("Node 2"), query)
             else:
                 print("Using Node 3")
-                df = fetch_data(conn3, query)
+                df = fetch_data(get_connection("Node 3"), query)
         else:
             print("Error: Could not find release date for the game.")
             df = pd.DataFrame()  # Return an empty DataFrame if no data found
 
     return df
 
-# Query to fetch data from the games table
-query = "SELECT * FROM games"
-df = fetch_data_with_fallback(query)
+# Load the full games table from Node 1 once per process; writes call refresh_games() to invalidate it
+@st.cache_data(show_spinner="Loading games...")
+def load_games_from_node_1():
+    return fetch_data(get_connection("Node 1"), "SELECT * FROM games")
+
+def load_games():
+    if is_connection_active("Node 1"):
+        try:
+            return load_games_from_node_1()
+        except Exception:
+            get_health_monitor().report_failure("Node 1")
+    # A fallback read only covers one partition, so it is not cached and the
+    # full table is loaded again as soon as Node 1 is back
+    return fetch_data_with_fallback("SELECT * FROM games")
+
+def refresh_games():
+    load_games_from_node_1.clear()
+
+# Facets built from the comma-separated columns, plus the platform flags
+FACET_COLUMNS = {
+    "Languages": "languages",
+    "Developers": "developers",
+    "Publishers": "publishers",
+    "Genres": "genres",
+}
+PLATFORM_COLUMNS = {"Windows": "windows", "Mac": "mac", "Linux": "linux"}
+FACETS = tuple(FACET_COLUMNS) + ("Platforms",)
+FACET_MATCH_MODES = ("Any selected tag (OR)", "All selected tags (AND)")
+REPORT_TOP_TAGS = 5  # Tags listed per facet on the report page
+FACET_TOMBSTONE_FRACTION = 0.25  # Share of removed documents that triggers a rebuild
+
+def popcount(bitmap):
+    return bin(bitmap).count("1")
+
+def tokenize_tags(value):
+    # Split a comma-separated column into tags, dropping list brackets and quotes
+    if not isinstance(value, str):
+        return []
+    tags = (tag.strip().strip("[]'\"").strip() for tag in value.split(","))
+    return list(dict.fromkeys(tag for tag in tags if tag))
+
+class FacetIndex:
+    """Inverted index from facet tags to the games that carry them.
+
+    Each game gets a document number. A tag's posting list is a sorted
+    array of document numbers while it is sparse and an int bitmap once
+    the bitmap would be smaller, so AND/OR filtering is done with integer
+    bit operations.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._postings = {facet: {} for facet in FACETS}
+        self._docs = {}  # game_id -> document number
+        self._game_ids = []  # document number -> game_id, None once removed
+        self._doc_tags = {}  # document number -> [(facet, tag), ...]
+        self._live = 0  # bitmap of documents that have not been removed
+
+    def build(self, df):
+        """Replace the index contents with the games in `df`."""
+        with self._lock:
+            self._reset()
+            columns = ["game_id"] + list(FACET_COLUMNS.values()) + list(PLATFORM_COLUMNS.values())
+            for game in df[columns].to_dict("records"):
+                self._add(game)
+            self._live = self._bitmap(range(len(self._game_ids)))
+            for facet_postings in self._postings.values():
+                for tag, posting in facet_postings.items():
+                    facet_postings[tag] = self._compact(posting)
+
+    def add(self, game):
+        """Index `game` (a mapping of column to value), replacing any older version."""
+        with self._lock:
+            doc = self._add(game)
+            self._live |= 1 << doc
+            for facet, tag in self._doc_tags[doc]:
+                self._postings[facet][tag] = self._compact(self._postings[facet][tag])
+
+    def remove(self, game_id):
+        with self._lock:
+            self._remove(int(game_id))
+
+    def covers(self, game_ids):
+        # True when exactly the games in `game_ids` are indexed
+        with self._lock:
+            return self._docs.keys() == game_ids
+
+    def fragmented(self):
+        # True once removed games hold too many of the document numbers
+        with self._lock:
+            return len(self._game_ids) - len(self._docs) > FACET_TOMBSTONE_FRACTION * len(self._game_ids)
+
+    def _add(self, game):
+        # An updated game keeps its document number; only its tags are replaced
+        game_id = int(game["game_id"])
+        doc = self._docs.get(game_id)
+        if doc is None:
+            doc = len(self._game_ids)
+            self._game_ids.append(game_id)
+            self._docs[game_id] = doc
+        else:
+            self._unpost(doc)
+
+        tags = [(facet, tag) for facet, column in FACET_COLUMNS.items() for tag in tokenize_tags(game[column])]
+        tags += [("Platforms", platform) for platform, column in PLATFORM_COLUMNS.items() if game[column] == 1]
+        self._doc_tags[doc] = tags
+        for facet, tag in tags:
+            posting = self._postings[facet].setdefault(tag, array("I"))
+            if isinstance(posting, int):
+                self._postings[facet][tag] = posting | 1 << doc
+            elif not posting or posting[-1] < doc:
+                posting.append(doc)
+            else:
+                posting.insert(bisect_left(posting, doc), doc)
+        return doc
+
+    def _remove(self, game_id):
+        doc = self._docs.pop(game_id, None)
+        if doc is None:
+            return
+        self._game_ids[doc] = None
+        self._live &= ~(1 << doc)
+        self._unpost(doc)
+
+    def _unpost(self, doc):
+        # Take the document out of the posting lists of its tags
+        for facet, tag in self._doc_tags.pop(doc):
+            posting = self._postings[facet][tag]
+            if isinstance(posting, int):
+                posting &= ~(1 << doc)
+            else:
+                del posting[bisect_left(posting, doc)]
+            if posting:
+                self._postings[facet][tag] = posting
+            else:
+                del self._postings[facet][tag]
+
+    def _compact(self, posting):
+        # Switch to a bitmap once the array would take more space than one
+        if not isinstance(posting, int) and len(posting) * 32 >= len(self._game_ids):
+            return self._bitmap(posting)
+        return posting
+
+    def _bitmap(self, posting):
+        if isinstance(posting, int):
+            return posting
+        bits = bytearray((len(self._game_ids) + 7) // 8)
+        for doc in posting:
+            bits[doc >> 3] |= 1 << (doc & 7)
+        return int.from_bytes(bits, "little")
+
+    def match(self, selected, match_all=False):
+        """Return the bitmap of games matching `selected` ({facet: [tags]}).
+
+        Tags within a facet are combined with OR, or with AND when
+        `match_all` is set; different facets are always combined with AND.
+        """
+        with self._lock:
+            result = self._live
+            for facet, tags in selected.items():
+                if not tags:
+                    continue
+                postings = [self._bitmap(self._postings[facet].get(tag, 0)) for tag in tags]
+                combined = postings[0]
+                for posting in postings[1:]:
+                    combined = combined & posting if match_all else combined | posting
+                result &= combined
+            return result
+
+    def counts(self, facet, result):
+        """Return {tag: games in `result` carrying it}, largest first."""
+        with self._lock:
+            result_bytes = result.to_bytes((len(self._game_ids) + 7) // 8, "little")
+            counts = {}
+            for tag, posting in self._postings[facet].items():
+                if isinstance(posting, int):
+                    count = popcount(posting & result)
+                else:
+                    count = sum(result_bytes[doc >> 3] >> (doc & 7) & 1 for doc in posting)
+                if count:
+                    counts[tag] = count
+        return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+    def tags(self, facet):
+        # Every tag of the facet, most common first
+        with self._lock:
+            sizes = {
+                tag: popcount(posting) if isinstance(posting, int) else len(posting)
+                for tag, posting in self._postings[facet].items()
+            }
+        return sorted(sizes, key=lambda tag: -sizes[tag])
+
+    def game_ids(self, result):
+        with self._lock:
+            data = result.to_bytes((result.bit_length() + 7) // 8, "little")
+            return [
+                self._game_ids[index * 8 + bit]
+                for index, byte in enumerate(data) if byte
+                for bit in range(8) if byte >> bit & 1
+            ]
+
+# One index per process, kept current by the write paths and rebuilt by
+# sync_facet_index() whenever the loaded table holds a different set of games
+# or too many removed games have left their document numbers behind
+@st.cache_resource(show_spinner=False)
+def get_facet_index():
+    return FacetIndex()
+
+def sync_facet_index(df):
+    index = get_facet_index()
+    if index.fragmented() or not index.covers(set(df["game_id"].astype(int).tolist())):
+        with st.spinner("Indexing games..."):
+            index.build(df)
+    return index
+
+def filter_by_facets(df):
+    """Render the facet filters and return the matching rows of `df` and their bitmap."""
+    index = sync_facet_index(df)
+    # Widget values from this run are already in session_state, so match before drawing
+    selected = {facet: st.session_state.get(f"facet_{facet}", []) for facet in FACETS}
+    match_all = st.session_state.get("facet_match_mode") == FACET_MATCH_MODES[1]
+    result = index.match(selected, match_all)
+
+    with st.expander("Filter by facets", expanded=any(selected.values())):
+        st.radio("Match", FACET_MATCH_MODES, key="facet_match_mode", horizontal=True)
+        for col, facet in zip(st.columns(len(FACETS)), FACETS):
+            counts = index.counts(facet, result)
+            col.multiselect(
+                facet,
+                index.tags(facet),
+                key=f"facet_{facet}",
+                format_func=lambda tag, counts=counts: f"{tag} ({counts.get(tag, 0)})",
+            )
 
-if 'df' not in st.session_state:
-    st.session_state.df = df
+    if any(selected.values()):
+        df = df[df["game_id"].isin(index.game_ids(result))].copy()
+    return df, result
 
 def date_helper(date):
     return date.strftime("%Y")
 
 def display_table(df):
+    import pandas as pd
+    from st_aggrid import AgGrid, GridOptionsBuilder
+
     df["release_date"] = pd.to_datetime(df["release_date"]).dt.strftime("%Y-%m-%d")
     
     df["Windows"] = df["windows"].map({1: "✔️", 0: "❌"})
@@ -148,13 +577,317 @@ def display_table(df):
         theme="streamlit",  
     )
 
-# Function to handle datetime and date conversion
-def datetime_converter(obj):
-    if isinstance(obj, datetime):
-        return obj.strftime('%Y-%m-%d %H:%M:%S')
-    elif isinstance(obj, date):
-        return obj.strftime('%Y-%m-%d')
-    return obj
+# Recovery log format
+#
+# The log starts with LOG_MAGIC and is followed by records of the form
+#   u32 body length | u32 crc32(body) | body
+# A body is either a statement definition, which interns a query text under a
+# numeric ID the first time it is written, or a transaction referencing that ID:
+#   RECORD_STATEMENT:   u8 kind | u32 statement id | utf-8 query text
+#   RECORD_TRANSACTION: u8 kind | u8 action | u8 node | u32 statement id | u32 param count | params
+# Each param is a one-byte type tag followed by its packed value.
+LOG_MAGIC = b"STXL\x01"
+RECORD_HEADER = struct.Struct("<II")
+STATEMENT_HEADER = struct.Struct("<BI")
+TRANSACTION_HEADER = struct.Struct("<BBBII")
+RECORD_STATEMENT = 0
+RECORD_TRANSACTION = 1
+
+# Operation codes are the position in this tuple, so only ever append to it
+LOG_ACTIONS = (
+    "INSERT", "UPDATE", "DELETE",
+    "INSERT_TEMP", "UPDATE_TEMP", "DELETE_TEMP",
+    "INSERT_REPLICATED", "UPDATE_REPLICATED", "DELETE_REPLICATED",
+    "REPLICATE_FAILURE",
+)
+LOG_NODES = ("Node 1", "Node 2", "Node 3")
+
+PARAM_NONE, PARAM_INT, PARAM_FLOAT, PARAM_STR, PARAM_DATE, PARAM_DATETIME, PARAM_DECIMAL = range(7)
+PARAM_INT_VALUE = struct.Struct("<q")
+PARAM_FLOAT_VALUE = struct.Struct("<d")
+PARAM_LENGTH = struct.Struct("<I")
+PARAM_DATE_VALUE = struct.Struct("<I")
+PARAM_DATETIME_VALUE = struct.Struct("<IQ")  # ordinal, microseconds since midnight
+
+LEGACY_LOG_FILE = "recovery_log.txt"  # JSON-lines log written by earlier versions
+
+def encode_param(param, out):
+    if param is None:
+        out.append(PARAM_NONE)
+    elif isinstance(param, numbers.Integral):
+        out.append(PARAM_INT)
+        out += PARAM_INT_VALUE.pack(int(param))
+    elif isinstance(param, Decimal):
+        text = str(param).encode("utf-8")
+        out.append(PARAM_DECIMAL)
+        out += PARAM_LENGTH.pack(len(text)) + text
+    elif isinstance(param, numbers.Real):
+        out.append(PARAM_FLOAT)
+        out += PARAM_FLOAT_VALUE.pack(float(param))
+    elif isinstance(param, datetime):
+        micros = ((param.hour * 60 + param.minute) * 60 + param.second) * 1_000_000 + param.microsecond
+        out.append(PARAM_DATETIME)
+        out += PARAM_DATETIME_VALUE.pack(param.toordinal(), micros)
+    elif isinstance(param, date):
+        out.append(PARAM_DATE)
+        out += PARAM_DATE_VALUE.pack(param.toordinal())
+    else:
+        text = str(param).encode("utf-8")
+        out.append(PARAM_STR)
+        out += PARAM_LENGTH.pack(len(text)) + text
+
+def decode_param(view, offset):
+    # Returns the decoded value and the offset just past it
+    tag = view[offset]
+    offset += 1
+    if tag == PARAM_NONE:
+        return None, offset
+    if tag == PARAM_INT:
+        return PARAM_INT_VALUE.unpack_from(view, offset)[0], offset + PARAM_INT_VALUE.size
+    if tag == PARAM_FLOAT:
+        return PARAM_FLOAT_VALUE.unpack_from(view, offset)[0], offset + PARAM_FLOAT_VALUE.size
+    if tag == PARAM_DATE:
+        ordinal, = PARAM_DATE_VALUE.unpack_from(view, offset)
+        return date.fromordinal(ordinal), offset + PARAM_DATE_VALUE.size
+    if tag == PARAM_DATETIME:
+        ordinal, micros = PARAM_DATETIME_VALUE.unpack_from(view, offset)
+        value = datetime.fromordinal(ordinal) + timedelta(microseconds=micros)
+        return value, offset + PARAM_DATETIME_VALUE.size
+    if tag in (PARAM_STR, PARAM_DECIMAL):
+        length, = PARAM_LENGTH.unpack_from(view, offset)
+        start = offset + PARAM_LENGTH.size
+        text = str(view[start:start + length], "utf-8")
+        return (Decimal(text) if tag == PARAM_DECIMAL else text), start + length
+    raise ValueError(f"Unknown parameter type {tag} in recovery log")
+
+def frame_record(body):
+    return RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body
+
+def iter_log_records(view):
+    # Yields (start offset, end offset, body) per record; body is None when the CRC does not match
+    offset = len(LOG_MAGIC)
+    while offset + RECORD_HEADER.size <= len(view):
+        length, crc = RECORD_HEADER.unpack_from(view, offset)
+        start = offset + RECORD_HEADER.size
+        if start + length > len(view):
+            return  # Torn write at the tail of the log
+        body = view[start:start + length]
+        yield offset, start + length, (body if zlib.crc32(body) == crc else None)
+        offset = start + length
+
+def parse_log(buffer, start=0):
+    """Parse a recovery log, yielding one entry dict per transaction record.
+
+    Records are sliced out of a memoryview over `buffer`, so nothing is copied
+    except the decoded strings. Corrupt records are yielded as None. Only
+    transactions at or after byte offset `start` are yielded.
+    """
+    view = memoryview(buffer)
+    if not view:
+        return
+    if view[:len(LOG_MAGIC)] != LOG_MAGIC:
+        raise ValueError(f"{LOG_FILE} is not a recovery log")
+
+    statements = {}
+    for offset, _, body in iter_log_records(view):
+        if body is None:
+            if offset >= start:
+                yield None
+        elif body[0] == RECORD_STATEMENT:
+            _, statement_id = STATEMENT_HEADER.unpack_from(body)
+            statements[statement_id] = str(body[STATEMENT_HEADER.size:], "utf-8")
+        else:
+            if offset < start:
+                continue
+            _, action, node, statement_id, count = TRANSACTION_HEADER.unpack_from(body)
+            if statement_id not in statements:
+                yield None  # Its statement record was lost
+                continue
+            offset = TRANSACTION_HEADER.size
+            params = []
+            for _ in range(count):
+                value, offset = decode_param(body, offset)
+                params.append(value)
+            yield {
+                "action": LOG_ACTIONS[action],
+                "node": LOG_NODES[node],
+                "query": statements[statement_id],
+                "params": tuple(params),
+            }
+
+class TransactionLog:
+    """Append-only recovery log kept open for the life of the process.
+
+    Appends use leader-based group commit: the first writer that finds no
+    fsync in progress flushes and fsyncs everything written so far, while
+    writers arriving during that fsync wait and are covered by the next one.
+    A lone writer therefore fsyncs straight away.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._durable = threading.Condition(self._lock)
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+        self._epoch = 0  # Bumped by every rewrite so stale snapshots are refused
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, "a+b")
+        self._file.seek(0)
+        data = self._file.read()
+        self._statements = {}
+        if not data:
+            self._file.write(LOG_MAGIC)
+            self._sync()
+            return
+
+        view = memoryview(data)
+        if view[:len(LOG_MAGIC)] != LOG_MAGIC:
+            raise ValueError(f"{self.path} is not a recovery log")
+        end = len(LOG_MAGIC)
+        for _, end, body in iter_log_records(view):
+            if body is not None and body[0] == RECORD_STATEMENT:
+                _, statement_id = STATEMENT_HEADER.unpack_from(body)
+                self._statements[str(body[STATEMENT_HEADER.size:], "utf-8")] = statement_id
+        # Drop a torn record left by a crash so new records stay readable
+        if end < len(data):
+            self._file.truncate(end)
+            self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _encode(self, action, node, query, params):
+        out = bytearray()
+        statement_id = self._statements.get(query)
+        if statement_id is None:
+            statement_id = max(self._statements.values(), default=-1) + 1
+            self._statements[query] = statement_id
+            out += frame_record(STATEMENT_HEADER.pack(RECORD_STATEMENT, statement_id) + query.encode("utf-8"))
+        body = bytearray(TRANSACTION_HEADER.pack(
+            RECORD_TRANSACTION, LOG_ACTIONS.index(action), LOG_NODES.index(node), statement_id, len(params)
+        ))
+        for param in params:
+            encode_param(param, body)
+        out += frame_record(bytes(body))
+        return bytes(out)
+
+    def append(self, action, node, query, params):
+        """Append a record and return once it has been fsynced."""
+        with self._lock:
+            self._file.write(self._encode(action, node, query, params))
+            self._written += 1
+            sequence = self._written
+            while self._synced < sequence:
+                if self._syncing:
+                    # The running fsync or the next one will cover this record
+                    self._durable.wait()
+                    continue
+
+                # Lead a batch: fsync outside the lock so other writers can append meanwhile
+                self._file.flush()
+                target = self._written
+                fd = self._file.fileno()
+                self._syncing = True
+                self._lock.release()
+                try:
+                    os.fsync(fd)
+                finally:
+                    self._lock.acquire()
+                    self._syncing = False
+                    self._durable.notify_all()
+                self._synced = max(self._synced, target)
+
+    def read(self):
+        """Return the entries in the log (None for corrupt records) and a snapshot position.
+
+        Pass the position to rewrite() so records appended after this read
+        are kept.
+        """
+        with self._lock:
+            self._file.flush()
+            with open(self.path, "rb") as log:
+                data = log.read()
+            position = (self._epoch, len(data))
+        return list(parse_log(data)), position
+
+    def rewrite(self, entries, position):
+        """Atomically replace the entries read at `position` with `entries`.
+
+        Records appended since that read are carried over after `entries`.
+        """
+        with self._lock:
+            epoch, offset = position
+            if epoch != self._epoch:
+                raise RuntimeError("The recovery log was rewritten by another session; try again.")
+            while self._syncing:
+                self._durable.wait()
+
+            self._file.flush()
+            with open(self.path, "rb") as log:
+                appended = [entry for entry in parse_log(log.read(), start=offset) if entry is not None]
+
+            self._statements = {}
+            out = bytearray(LOG_MAGIC)
+            for entry in list(entries) + appended:
+                out += self._encode(entry["action"], entry["node"], entry["query"], entry["params"])
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "wb") as temp:
+                temp.write(out)
+                temp.flush()
+                os.fsync(temp.fileno())
+            self._file.close()
+            os.replace(temp_path, self.path)
+            directory = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+            self._file = open(self.path, "a+b")
+            self._epoch += 1
+            # Every record written so far is either in the new file or was dropped on purpose
+            self._synced = self._written
+            self._durable.notify_all()
+
+def legacy_param(param):
+    # The JSON log stored dates and datetimes as strings
+    if isinstance(param, str):
+        for fmt, convert in (("%Y-%m-%d %H:%M:%S", lambda value: value), ("%Y-%m-%d", datetime.date)):
+            try:
+                return convert(datetime.strptime(param, fmt))
+            except ValueError:
+                pass
+    return param
+
+def migrate_legacy_log(log, path):
+    # Move the entries of a JSON-lines log from earlier versions in front of the binary log, then set it aside
+    if not os.path.exists(path):
+        return
+    legacy_entries = []
+    with open(path, "r") as legacy:
+        for line in legacy:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # The JSON readers skipped invalid lines too
+            entry["params"] = tuple(legacy_param(param) for param in entry["params"])
+            legacy_entries.append(entry)
+    if legacy_entries:
+        entries, position = log.read()
+        log.rewrite(legacy_entries + [entry for entry in entries if entry is not None], position)
+    os.replace(path, path + ".migrated")
+
+@st.cache_resource(show_spinner=False)
+def get_transaction_log():
+    log = TransactionLog(LOG_FILE)
+    migrate_legacy_log(log, LEGACY_LOG_FILE)
+    return log
 
 # Utility: Simulate replication lag
 def simulate_replication_lag():
@@ -163,13 +896,12 @@ def simulate_replication_lag():
 # Automatic Recovery for a Node
 def recover_node(node, conn, cursor):
     try:
-        with open(LOG_FILE, "r") as log:
-            for line in log:
-                entry = json.loads(line.strip())
-                if entry["node"] != node:
-                    params = entry["params"]
-                    cursor.execute(entry["query"], params)
-                    conn.commit()
+        entries, _ = get_transaction_log().read()
+        for entry in entries:
+            if entry is not None and entry["node"] != node:
+                params = entry["params"]
+                cursor.execute(entry["query"], params)
+                conn.commit()
         st.success(f"Automatic recovery completed for {node}.")
     except Exception as e:
         st.error(f"Error during recovery for {node}: {e}")
@@ -177,18 +909,7 @@ def recover_node(node, conn, cursor):
 # Function to log transactions (simulate database insertion)
 def log_transaction(action, node, query, params):
     try:
-        params = [
-            datetime_converter(param) if isinstance(param, (datetime, date)) else param
-            for param in params
-        ]
-        log_entry = {
-            "action": action,
-            "node": node,
-            "query": query,
-            "params": params,
-        }
-        with open(LOG_FILE, "a") as log_file:
-            log_file.write(json.dumps(log_entry) + "\n")
+        get_transaction_log().append(action, node, query, params)
     except Exception as e:
         st.error(f"Error logging transaction: {e}")
         raise
@@ -198,57 +919,56 @@ RETRY_DELAY = 2  # Delay in seconds before retrying
 
 def replicate_from_temp_logs_to_node_1():
     try:
-        with open(LOG_FILE, "r") as log:
-            lines = log.readlines()
+        log = get_transaction_log()
+        entries, position = log.read()
 
-        if not lines:
+        if not entries:
             return  # No logs to process
 
         updated_logs = []
-        for line in lines:
-            try:
-                entry = json.loads(line.strip())
-                action = entry["action"]
-                query = entry["query"]
-                params = entry["params"]
-
-                if action.endswith("_TEMP") and entry["node"] != "Node 1":
-                    # Simulate failure when attempting to replicate to Node 1 from Node 2 or Node 3
-                    if st.session_state.get("simulate_failure_node_1", False):
-                        log_transaction("REPLICATE_FAILURE", "Node 1", query, params)
-                        raise Exception("Simulated failure while replicating to Node 1 from Node 2 or Node 3.")
-                    attempt = 0
-                    while attempt < MAX_RETRIES:
-                        try:
-                            if action.startswith("INSERT"):
-                                conn1_cursor.execute(query, params)
-                            elif action.startswith("UPDATE"):
-                                conn1_cursor.execute(query, params)
-                            elif action.startswith("DELETE"):
-                                conn1_cursor.execute(query, params)
-
-                            conn1.commit()
-                            log_transaction(action.replace("_TEMP", "_REPLICATED"), "Node 1", query, params)
-                            st.success(f"{action.replace('_TEMP', '')} operation replicated to Node 1 successfully..")
-                            break
-                        except Exception as e:
-                            attempt += 1
-                            if attempt < MAX_RETRIES:
-                                st.warning(f"Retrying {action} to Node 1 in {RETRY_DELAY} seconds... (Attempt {attempt}/{MAX_RETRIES})")
-                                time.sleep(RETRY_DELAY)
-                            else:
-                                st.error(f"Failed to replicate {action} to Node 1 after {MAX_RETRIES} attempts: {e}")
-                                updated_logs.append(line)
-                                break
-                else:
-                    updated_logs.append(line)  # Retain logs not meant for replication to Node 1
-
-            except json.JSONDecodeError:
+        for entry in entries:
+            if entry is None:
                 st.warning("Skipping invalid log entry.")
                 continue
 
-        with open(LOG_FILE, "w") as log:
-            log.writelines(updated_logs)
+            action = entry["action"]
+            query = entry["query"]
+            params = entry["params"]
+
+            if action.endswith("_TEMP") and entry["node"] != "Node 1":
+                # Simulate failure when attempting to replicate to Node 1 from Node 2 or Node 3
+                if st.session_state.get("simulate_failure_node_1", False):
+                    log_transaction("REPLICATE_FAILURE", "Node 1", query, params)
+                    raise Exception("Simulated failure while replicating to Node 1 from Node 2 or Node 3.")
+                attempt = 0
+                while attempt < MAX_RETRIES:
+                    try:
+                        if action.startswith("INSERT"):
+                            get_cursor("Node 1").execute(query, params)
+                        elif action.startswith("UPDATE"):
+                            get_cursor("Node 1").execute(query, params)
+                        elif action.startswith("DELETE"):
+                            get_cursor("Node 1").execute(query, params)
+
+                        get_connection("Node 1").commit()
+                        log_transaction(action.replace("_TEMP", "_REPLICATED"), "Node 1", query, params)
+                        st.success(f"{action.replace('_TEMP', '')} operation replicated to Node 1 successfully..")
+                        break
+                    except Exception as e:
+                        attempt += 1
+                        if attempt < MAX_RETRIES:
+                            st.warning(f"Retrying {action} to Node 1 in {RETRY_DELAY} seconds... (Attempt {attempt}/{MAX_RETRIES})")
+                            time.sleep(RETRY_DELAY)
+                        else:
+                            st.error(f"Failed to replicate {action} to Node 1 after {MAX_RETRIES} attempts: {e}")
+                            updated_logs.append(entry)
+                            break
+            else:
+                updated_logs.append(entry)  # Retain logs not meant for replication to Node 1
+
+        # Only touch the file when an entry was replicated or dropped
+        if len(updated_logs) < len(entries):
+            log.rewrite(updated_logs, position)
 
     except Exception as e:
         st.error(f"Error during replication: {e}")
@@ -257,71 +977,68 @@ def replicate_from_temp_logs_to_node_1():
 backup_node = None
 def replicate_from_temp_logs_to_backup_node():
     try:
-        with open(LOG_FILE, "r") as log:
-            lines = log.readlines()
+        log = get_transaction_log()
+        entries, position = log.read()
 
-        if not lines:
+        if not entries:
             return  # No logs to process
 
         updated_logs = []
-        for line in lines:
-            try:
-                entry = json.loads(line.strip())
-                action = entry["action"]
-                node = entry["node"]
-                query = entry["query"]
-                params = entry["params"]
-                
-                release_date = entry["params"][2]
-                year = datetime.strptime(release_date, "%Y-%m-%d").year
-
-                if (year < 2010 and node_status['Node 2']== False or year >= 2010 and node_status['Node 3'] == False):
-                    return
-                if action.endswith("_TEMP"):
-                    if st.session_state.get("simulate_failure_node_2or3", False):
-                        if node == "Node 2":
-                            log_transaction("REPLICATE_FAILURE", "Node 2", query, params)
-                            raise Exception("Simulated failure while replicating to Node 2 from Node 1.")
-                        else:
-                            log_transaction("REPLICATE_FAILURE", "Node 3", query, params)
-                            raise Exception("Simulated failure while replicating to Node 3 from Node 1.")
-                    attempt = 0
-                    while attempt < MAX_RETRIES:
-                        try:
-                            if action.startswith("INSERT"):
-                                cursor = conn2_cursor if node == "Node 2" else conn3_cursor
-                                cursor.execute(query, params)
-                            elif action.startswith("UPDATE"):
-                                cursor = conn2_cursor if node == "Node 2" else conn3_cursor
-                                cursor.execute(query, params)
-                            elif action.startswith("DELETE"):
-                                cursor = conn2_cursor if node == "Node 2" else conn3_cursor
-                                cursor.execute(query, params)
-
-                            conn = conn2 if node == "Node 2" else conn3
-                            conn.commit()
-                            log_transaction(action.replace("_TEMP", "_REPLICATED"), node, query, params)
-                            st.success(f"{action.replace('_TEMP', '')} operation replicated to {node} successfully.")
-                            break
-                        except Exception as e:
-                            attempt += 1
-                            if attempt < MAX_RETRIES:
-                                st.warning(f"Retrying {action} to {node} in {RETRY_DELAY} seconds... (Attempt {attempt}/{MAX_RETRIES})")
-                                time.sleep(RETRY_DELAY)
-                            else:
-                                print(f"Node status of {node}: {node_status[node]} Replicating from temp logs.")
-                                st.error(f"Failed to replicate {action} to {node} after {MAX_RETRIES} attempts: {e}")
-                                updated_logs.append(line)
-                                break
-                else:
-                    updated_logs.append(line)  # Retain logs not meant for replication to the backup node
-
-            except json.JSONDecodeError:
+        for entry in entries:
+            if entry is None:
                 st.warning("Skipping invalid log entry.")
                 continue
 
-        with open(LOG_FILE, "w") as log:
-            log.writelines(updated_logs)
+            action = entry["action"]
+            node = entry["node"]
+            query = entry["query"]
+            params = entry["params"]
+            
+            # Stop if the node this entry replays onto is still down
+            if not node_available("Node 2" if node == "Node 2" else "Node 3"):
+                return
+            if action.endswith("_TEMP"):
+                if st.session_state.get("simulate_failure_node_2or3", False):
+                    if node == "Node 2":
+                        log_transaction("REPLICATE_FAILURE", "Node 2", query, params)
+                        raise Exception("Simulated failure while replicating to Node 2 from Node 1.")
+                    else:
+                        log_transaction("REPLICATE_FAILURE", "Node 3", query, params)
+                        raise Exception("Simulated failure while replicating to Node 3 from Node 1.")
+                attempt = 0
+                while attempt < MAX_RETRIES:
+                    try:
+                        if action.startswith("INSERT"):
+                            cursor = get_cursor("Node 2") if node == "Node 2" else get_cursor("Node 3")
+                            cursor.execute(query, params)
+                        elif action.startswith("UPDATE"):
+                            cursor = get_cursor("Node 2") if node == "Node 2" else get_cursor("Node 3")
+                            cursor.execute(query, params)
+                        elif action.startswith("DELETE"):
+                            cursor = get_cursor("Node 2") if node == "Node 2" else get_cursor("Node 3")
+                            cursor.execute(query, params)
+
+                        conn = get_connection("Node 2") if node == "Node 2" else get_connection("Node 3")
+                        conn.commit()
+                        log_transaction(action.replace("_TEMP", "_REPLICATED"), node, query, params)
+                        st.success(f"{action.replace('_TEMP', '')} operation replicated to {node} successfully.")
+                        break
+                    except Exception as e:
+                        attempt += 1
+                        if attempt < MAX_RETRIES:
+                            st.warning(f"Retrying {action} to {node} in {RETRY_DELAY} seconds... (Attempt {attempt}/{MAX_RETRIES})")
+                            time.sleep(RETRY_DELAY)
+                        else:
+                            print(f"Node status of {node}: {node_available(node)} Replicating from temp logs.")
+                            st.error(f"Failed to replicate {action} to {node} after {MAX_RETRIES} attempts: {e}")
+                            updated_logs.append(entry)
+                            break
+            else:
+                updated_logs.append(entry)  # Retain logs not meant for replication to the backup node
+
+        # Only touch the file when an entry was replicated or dropped
+        if len(updated_logs) < len(entries):
+            log.rewrite(updated_logs, position)
 
     except Exception as e:
         st.error(f"Error during replication: {e}")
@@ -329,8 +1046,10 @@ def replicate_from_temp_logs_to_backup_node():
 def show():
     """Display all games in the database."""
     st.header("Show Games 🎮")
+    df = load_games()
     if not df.empty:
-        st.write("Displaying all games in the database:")
+        df, _ = filter_by_facets(df)
+        st.write(f"Displaying {len(df)} games from the database:")
         display_table(df)
     else:
         st.warning("No games available to display.")
@@ -374,22 +1093,22 @@ def insert():
         year = release_date.year
 
         try:
-            if node_status["Node 1"]:
+            if node_available("Node 1"):
                 # If Node 1 is up
                 global backup_node 
-                conn1_cursor.execute(query, params)
-                conn1.commit()
+                get_cursor("Node 1").execute(query, params)
+                get_connection("Node 1").commit()
                 st.info(f"Data inserted into Node 1.")
 
                 # Depending on the year, log for replication to the backup node (Node 2 or Node 3)
-                if(node_status["Node 1"] and (node_status["Node 2"] == False or node_status["Node 3"]== False)):
+                if(node_available("Node 1") and (node_available("Node 2") == False or node_available("Node 3")== False)):
                     backup_node = "Node 2" if year < 2010 else "Node 3"
                     log_transaction("INSERT_TEMP", backup_node, query, params)
                     st.info(f"Will replicate to {backup_node} once it comes back online")
                 else:
                     backup_node = "Node 2" if year <= 2010 else "Node 3"
-                    cursor = conn2_cursor if backup_node == "Node 2" else conn3_cursor
-                    conn = conn2 if backup_node == "Node 2" else conn3
+                    cursor = get_cursor(backup_node)
+                    conn = get_connection(backup_node)
                     cursor.execute(query, params)
                     conn.commit()
                     log_transaction("INSERT", backup_node, query, params)
@@ -397,8 +1116,8 @@ def insert():
             else:
                 # If Node 1 is down
                 backup_node = "Node 2" if year <= 2010 else "Node 3"
-                cursor = conn2_cursor if backup_node == "Node 2" else conn3_cursor
-                conn = conn2 if backup_node == "Node 2" else conn3
+                cursor = get_cursor(backup_node)
+                conn = get_connection(backup_node)
                 cursor.execute(query, params)
                 conn.commit()
                 log_transaction("INSERT_TEMP", backup_node, query, params)
@@ -407,18 +1126,23 @@ def insert():
                 st.info("Will replicate to Node 1 once it comes back online.")
 
                 # Attempt replication to Node 1 if it comes back online
-                if node_status["Node 1"]:
+                if node_available("Node 1"):
                     replicate_from_temp_logs_to_node_1()
 
+            # Keep the facet index in step with the new row
+            get_facet_index().add(dict(zip(GAME_COLUMNS, params)))
+
         except Exception as e:
             st.error(f"Error inserting game: {e}")
 
         finally:
             # Update the DataFrame after insert
-            st.session_state.df = fetch_data(conn1, "SELECT * FROM games")
+            refresh_games()
 
 
 def search():
+    import mysql.connector
+
     st.header("Search Game 🔍")
     with st.form("search_form"):
         search_term = st.text_input("Search by Game ID")
@@ -427,7 +1151,7 @@ def search():
         if submitted:
             try:
                 search_query = f"SELECT * FROM games WHERE game_id = '{search_term}' FOR UPDATE;"
-                search_results = fetch_data(conn1, search_query)
+                search_results = fetch_data(get_connection("Node 1"), search_query)
 
                 if not search_results.empty:
                     game = search_results.iloc[0]  # Get the first and only row
@@ -451,7 +1175,10 @@ def search():
                 st.warning(f"Error: {err}")
 
 def update():
+    import pandas as pd
+
     st.header("Update Game ✏️")
+    df = load_games()
 
     with st.form("Search"):
         search_term = st.text_input("Search by Game ID or Name")
@@ -521,75 +1248,75 @@ def update():
                     if original_year < 2010 and updated_year >= 2010:
                         print("HAPPY PATH")
                         # Transition from Node 2 to Node 3
-                        conn1_cursor.execute(query_update, params_update)
+                        get_cursor("Node 1").execute(query_update, params_update)
                         time.sleep(5)
-                        conn1.commit()
+                        get_connection("Node 1").commit()
                         log_transaction("UPDATE", "Node 1", query_update, params_update)
 
-                        conn3_cursor.execute(query_insert, params_insert)
-                        conn3.commit()
+                        get_cursor("Node 3").execute(query_insert, params_insert)
+                        get_connection("Node 3").commit()
                         log_transaction("INSERT", "Node 3", query_insert, params_insert)
 
-                        conn2_cursor.execute("DELETE FROM games WHERE game_id = %s", (int(game_id),))
-                        conn2.commit()
+                        get_cursor("Node 2").execute("DELETE FROM games WHERE game_id = %s", (int(game_id),))
+                        get_connection("Node 2").commit()
                         log_transaction("DELETE", "Node 2", "DELETE FROM games WHERE game_id = %s", (int(game_id),))
 
                     elif int(original_year) >= 2010 and updated_year < 2010:
                         print("HAPPY PATH")
                         # Transition from Node 3 to Node 2
-                        conn1_cursor.execute(query_update, params_update)
+                        get_cursor("Node 1").execute(query_update, params_update)
                         time.sleep(5)
-                        conn1.commit()
+                        get_connection("Node 1").commit()
                         log_transaction("UPDATE", "Node 1", query_update, params_update)
 
-                        conn2_cursor.execute(query_insert, params_insert)
-                        conn2.commit()
+                        get_cursor("Node 2").execute(query_insert, params_insert)
+                        get_connection("Node 2").commit()
                         log_transaction("INSERT", "Node 2", query_insert, params_insert)
 
-                        conn3_cursor.execute("DELETE FROM games WHERE game_id = %s", (int(game_id),))
-                        conn3.commit()
+                        get_cursor("Node 3").execute("DELETE FROM games WHERE game_id = %s", (int(game_id),))
+                        get_connection("Node 3").commit()
                         log_transaction("DELETE", "Node 3", "DELETE FROM games WHERE game_id = %s", (int(game_id),))
 
                     elif (int(original_year) and updated_year) >= 2010 or (int(original_year) and updated_year) < 2010:
-                        conn1_cursor.execute(query_update, params_update)
+                        get_cursor("Node 1").execute(query_update, params_update)
                         time.sleep(5)
-                        conn1.commit()
+                        get_connection("Node 1").commit()
                         log_transaction("UPDATE", "Node 1", query_update, params_update)
                         if updated_year < 2010:
-                            conn2_cursor.execute(query_update, params_update)
-                            conn2.commit()
+                            get_cursor("Node 2").execute(query_update, params_update)
+                            get_connection("Node 2").commit()
                             log_transaction("UPDATE", "Node 2", query_update, params_insert)
                         else:
-                            conn3_cursor.execute(query_update, params_update)
-                            conn3.commit()
+                            get_cursor("Node 3").execute(query_update, params_update)
+                            get_connection("Node 3").commit()
                             log_transaction("UPDATE", "Node 3", query_update, params_insert)
 
                     else:
                         # Update within the same node
                         print("SAD PATH")
-                        if node_status["Node 1"]:
-                            conn1_cursor.execute(query_update, params_update)
+                        if node_available("Node 1"):
+                            get_cursor("Node 1").execute(query_update, params_update)
                             time.sleep(5)
-                            conn1.commit()
+                            get_connection("Node 1").commit()
                             st.info(f"Data updated into Node 1.")
 
                             # Depending on the year, log for replication to the backup node (Node 2 or Node 3)
-                            if(node_status["Node 1"] and (node_status["Node 2"] == False or node_status["Node 3"]== False)):
+                            if(node_available("Node 1") and (node_available("Node 2") == False or node_available("Node 3")== False)):
                                 backup_node = "Node 2" if updated_year < 2010 else "Node 3"
                                 log_transaction("UPDATE_TEMP", backup_node, query_update, params_update)
                                 st.warning(f"Node {backup_node} is unavailable. Will replicate update to {backup_node} once it comes back online")
                             else:    
                                 backup_node = "Node 2" if updated_year <=2010 else "Node 3"
-                                cursor = conn2_cursor if backup_node == "Node 2" else conn3_cursor
-                                conn = conn2 if backup_node == "Node 2" else conn3
+                                cursor = get_cursor(backup_node)
+                                conn = get_connection(backup_node)
                                 cursor.execute(query_update, params_update)
                                 conn.commit()
                                 log_transaction("UPDATE", backup_node, query_update, params_update)
                                 st.success(f"Game successfully updated for {backup_node}.")
                         else:
                             backup_node = "Node 2" if updated_year <= 2010 else "Node 3"
-                            cursor = conn2_cursor if backup_node == "Node 2" else conn3_cursor
-                            conn = conn2 if backup_node == "Node 2" else conn3
+                            cursor = get_cursor(backup_node)
+                            conn = get_connection(backup_node)
                             cursor.execute(query_update, params_update)
                             time.sleep(5)
                             conn.commit()
@@ -597,15 +1324,18 @@ def update():
                             log_transaction("UPDATE_TEMP", "Node 1", query_update, params_update)
                             st.warning(f"Node 1 is unavailable. UPDATE applied to {backup_node} temporarily.")
 
+                    get_facet_index().add(dict(zip(GAME_COLUMNS, params_insert)))
+
                 except Exception as e:
                     st.error(f"Error updating game: {e}")
                 finally:
                     # Refresh Data
-                    st.session_state.df = fetch_data(conn1, "SELECT * FROM games")
+                    refresh_games()
 
 
 def delete():
-    search_df = st.session_state.df
+    df = load_games()
+    search_df = df
     st.header("Delete Game 🗑️")
 
     # Search for the game by ID or Name
@@ -628,21 +1358,21 @@ def delete():
             if st.button("Delete"):
                 try:
                     # Attempt deletion from Node 1
-                    if node_status["Node 1"]:
-                        conn1_cursor.execute(query, params)
+                    if node_available("Node 1"):
+                        get_cursor("Node 1").execute(query, params)
                         time.sleep(5)
-                        conn1.commit()
+                        get_connection("Node 1").commit()
                         st.success(f"Game successfully deleted from Node 1.")
 
                         # Depending on the year, log for replication to the backup node (Node 2 or Node 3)
-                        if(node_status["Node 1"] and (node_status["Node 2"] == False or node_status["Node 3"]== False)):
+                        if(node_available("Node 1") and (node_available("Node 2") == False or node_available("Node 3")== False)):
                                 backup_node = "Node 2" if year < 2010 else "Node 3"
                                 log_transaction("DELETE_TEMP", backup_node, query, params)
                                 st.info(f"Will delete from {backup_node} once it comes back online NEW")
                         else:    
                             backup_node = "Node 2" if int(year) <= 2010 else "Node 3"
-                            cursor = conn2_cursor if backup_node == "Node 2" else conn3_cursor
-                            conn = conn2 if backup_node == "Node 2" else conn3
+                            cursor = get_cursor(backup_node)
+                            conn = get_connection(backup_node)
                             cursor.execute(query, params)
                             conn.commit()
                             log_transaction("DELETE", backup_node, query, params)
@@ -651,8 +1381,8 @@ def delete():
                     else:
                         # Node 1 is unavailable, delete from backup node
                         backup_node = "Node 2" if int(year) <= 2010 else "Node 3"
-                        cursor = conn2_cursor if backup_node == "Node 2" else conn3_cursor
-                        conn = conn2 if backup_node == "Node 2" else conn3
+                        cursor = get_cursor(backup_node)
+                        conn = get_connection(backup_node)
                         cursor.execute(query, params)
                         time.sleep(5)
                         conn.commit()
@@ -661,22 +1391,244 @@ def delete():
                         st.warning(f"Node 1 is unavailable. Delete applied to {backup_node} temporarily.")
 
                         # Optionally trigger replication from temporary logs to Node 1 later
-                        if node_status["Node 1"]:
+                        if node_available("Node 1"):
                             replicate_from_temp_logs_to_node_1()
-                        # Update local DataFrame
-                        st.session_state.df = fetch_data(conn1, "SELECT * FROM games")
+
+                    get_facet_index().remove(selected_id)
 
                 except Exception as e:
                     st.error(f"Error deleting game: {e}")
+                finally:
+                    # Update local DataFrame
+                    refresh_games()
         else:
             st.warning("Game ID not found!")
     else:
         st.warning("No results found for your search.")
 
 
+PARTITION_YEAR = 2010  # Node 2 holds games released before this year, Node 3 the rest
+GAME_COLUMNS = (
+    "game_id", "name", "release_date", "required_age", "price",
+    "windows", "mac", "linux", "languages", "developers", "publishers", "genres",
+)
+
+PARTITION_NODES = ("Node 2", "Node 3")
+
+def partition_node(year):
+    return "Node 2" if year < PARTITION_YEAR else "Node 3"
+
+def id_list_clause(game_ids):
+    return f"game_id IN ({', '.join(['%s'] * len(game_ids))})"
+
+def like_pattern(text):
+    # Match `text` literally inside a LIKE ... ESCAPE '!' pattern, so % and _ are not wildcards
+    for char in "!%_":
+        text = text.replace(char, "!" + char)
+    return f"%{text}%"
+
+def build_bulk_predicate(publisher, genre, release_from, release_to, game_ids):
+    # Returns a WHERE clause and its params; every filter that is set must match
+    clauses, params = [], []
+    if publisher:
+        clauses.append("publishers LIKE %s ESCAPE '!'")
+        params.append(like_pattern(publisher))
+    if genre:
+        clauses.append("genres LIKE %s ESCAPE '!'")
+        params.append(like_pattern(genre))
+    if release_from:
+        clauses.append("release_date >= %s")
+        params.append(release_from)
+    if release_to:
+        clauses.append("release_date <= %s")
+        params.append(release_to)
+    if game_ids:
+        clauses.append(id_list_clause(game_ids))
+        params.extend(game_ids)
+    return " AND ".join(clauses), params
+
+def select_bulk_targets(where, params):
+    """Return {node: [game_id, ...]} for the games matching `where` on each node.
+
+    Partition membership is read from Node 2 and Node 3 themselves, because
+    the single-game writes do not all put release year 2010 on the same
+    side. Only games on an unavailable partition node are placed by year.
+    """
+    rows_by_node = {}
+    for node in ("Node 1",) + PARTITION_NODES:
+        if node_available(node):
+            cursor = get_cursor(node)
+            cursor.execute(f"SELECT game_id, release_date FROM games WHERE {where}", params)
+            rows_by_node[node] = cursor.fetchall()
+
+    down = [node for node in PARTITION_NODES if not node_available(node)]
+    if down and "Node 1" in rows_by_node:
+        held = {game_id for node in PARTITION_NODES for game_id, _ in rows_by_node.get(node, [])}
+        undated = 0
+        for game_id, release_date in rows_by_node["Node 1"]:
+            if game_id in held:
+                continue
+            if len(down) == 1:
+                node = down[0]  # Not on the available partition, so it lives on the other one
+            elif release_date is None:
+                undated += 1
+                continue
+            else:
+                node = partition_node(release_date.year)
+            rows_by_node.setdefault(node, []).append((game_id, release_date))
+        if undated:
+            st.warning(f"{undated} matching games have no release date, so their partition is unknown. They are only changed on Node 1.")
+
+    return {node: [game_id for game_id, _ in rows] for node, rows in rows_by_node.items() if rows}
+
+def run_bulk_statement(action, node, query, params, replicate_to_node_1=False):
+    # Apply one set-based statement to a node, or log it for replication if the node is down
+    if not node_available(node):
+        log_transaction(f"{action}_TEMP", node, query, params)
+        st.warning(f"{node} is unavailable. Will apply {action} once it comes back online.")
+        return
+    cursor = get_cursor(node)
+    cursor.execute(query, params)
+    get_connection(node).commit()
+    # While Node 1 is down, partition writes are logged as temporary so they replay onto Node 1
+    log_transaction(f"{action}_TEMP" if replicate_to_node_1 else action, node, query, params)
+    st.info(f"{action} applied to {cursor.rowcount} games on {node}.")
+
+def move_between_partitions(game_ids, source, target):
+    # Copy the already-updated rows into their new partition, then remove them from the old one
+    row_node = "Node 1" if node_available("Node 1") else source
+    if not node_available(row_node):
+        st.error(f"Cannot move {len(game_ids)} games from {source} to {target}: no node holds their data.")
+        return
+    cursor = get_cursor(row_node)
+    cursor.execute(f"SELECT {', '.join(GAME_COLUMNS)} FROM games WHERE {id_list_clause(game_ids)}", game_ids)
+    rows = cursor.fetchall()
+    if not rows:
+        return
+
+    row_placeholder = f"({', '.join(['%s'] * len(GAME_COLUMNS))})"
+    query_insert = f"INSERT INTO games ({', '.join(GAME_COLUMNS)}) VALUES {', '.join([row_placeholder] * len(rows))}"
+    params_insert = [value for row in rows for value in row]
+    run_bulk_statement("INSERT", target, query_insert, params_insert)
+    run_bulk_statement("DELETE", source, f"DELETE FROM games WHERE {id_list_clause(game_ids)}", game_ids)
+
+def bulk_update(targets, assignments):
+    set_clause = ", ".join(f"{column} = %s" for column in assignments)
+    set_params = list(assignments.values())
+    node_1_up = node_available("Node 1")
+
+    if "Node 1" in targets:
+        query = f"UPDATE games SET {set_clause} WHERE {id_list_clause(targets['Node 1'])}"
+        run_bulk_statement("UPDATE", "Node 1", query, set_params + targets["Node 1"])
+
+    for node in PARTITION_NODES:
+        game_ids = targets.get(node)
+        if not game_ids:
+            continue
+        query = f"UPDATE games SET {set_clause} WHERE {id_list_clause(game_ids)}"
+        run_bulk_statement("UPDATE", node, query, set_params + game_ids, replicate_to_node_1=not node_1_up)
+
+        # A new release date may move these games into the other partition
+        if "release_date" in assignments:
+            new_node = partition_node(assignments["release_date"].year)
+            if new_node != node:
+                move_between_partitions(game_ids, node, new_node)
+
+def bulk_delete(targets):
+    node_1_up = node_available("Node 1")
+
+    if "Node 1" in targets:
+        query = f"DELETE FROM games WHERE {id_list_clause(targets['Node 1'])}"
+        run_bulk_statement("DELETE", "Node 1", query, targets["Node 1"])
+    for node in PARTITION_NODES:
+        game_ids = targets.get(node)
+        if not game_ids:
+            continue
+        query = f"DELETE FROM games WHERE {id_list_clause(game_ids)}"
+        run_bulk_statement("DELETE", node, query, game_ids, replicate_to_node_1=not node_1_up)
+
+    index = get_facet_index()
+    for game_id in set().union(*targets.values()):
+        index.remove(game_id)
+
+def bulk():
+    st.header("Bulk Operations 📦")
+    with st.form("bulk_form"):
+        st.write("Select every game matching all of the filters below:")
+        publisher = st.text_input("Publisher contains")
+        genre = st.text_input("Genre contains")
+        cols = st.columns(2)
+        release_from = cols[0].date_input("Released on or after", value=None)
+        release_to = cols[1].date_input("Released on or before", value=None)
+        game_ids = st.text_input("Game IDs (comma-separated)")
+
+        operation = st.radio("Operation", ["Update", "Delete"], horizontal=True)
+        st.write("Fields to set when updating (leave empty to keep):")
+        cols = st.columns(3)
+        price = cols[0].number_input("Set Price", min_value=0.0, step=0.01, value=None)
+        required_age = cols[1].number_input("Set Required Age", min_value=0, step=1, value=None)
+        release_date = cols[2].date_input("Set Release Date", value=None)
+
+        cols = st.columns(2)
+        preview = cols[0].form_submit_button("Preview")
+        apply = cols[1].form_submit_button("Apply")
+
+    if not (preview or apply):
+        return
+
+    try:
+        game_ids = [int(game_id) for game_id in game_ids.split(",") if game_id.strip()]
+    except ValueError:
+        st.error("Game IDs must be comma-separated numbers.")
+        return
+    where, params = build_bulk_predicate(publisher, genre, release_from, release_to, game_ids)
+    if not where:
+        st.warning("Set at least one filter.")
+        return
+
+    assignments = {
+        column: value
+        for column, value in (("price", price), ("required_age", required_age), ("release_date", release_date))
+        if value is not None
+    }
+    if apply and operation == "Update" and not assignments:
+        st.warning("Set at least one field to update.")
+        return
+
+    try:
+        targets = select_bulk_targets(where, params)
+    except Exception as e:
+        st.error(f"Error selecting games: {e}")
+        return
+    if not node_available("Node 1") and not all(node_available(node) for node in PARTITION_NODES):
+        st.warning("Node 1 and a partition node are unavailable. Only games on the available partition were matched.")
+    if not targets:
+        st.warning("No games match these filters.")
+        return
+
+    for node, node_ids in targets.items():
+        st.write(f"{node}: {len(node_ids)} games")
+    if preview:
+        return
+
+    try:
+        if operation == "Delete":
+            bulk_delete(targets)
+        else:
+            bulk_update(targets, assignments)
+        st.success(f"Bulk {operation.lower()} finished for {len(set().union(*targets.values()))} games.")
+    except Exception as e:
+        st.error(f"Error running bulk {operation.lower()}: {e}")
+    finally:
+        # Only an applied operation changes the table
+        refresh_games()
+
+
 def report():
+    import pandas as pd
+
     st.header("Game Report 📊")
-    report_df = st.session_state.df
+    report_df, result = filter_by_facets(load_games())
     total_games = report_df.shape[0]
 
     report_df['year'] = pd.to_datetime(report_df['release_date'], errors='coerce').dt.year
@@ -698,12 +1650,23 @@ def report():
     st.write(f"Mac: {mac}")
     st.write(f"linux: {linux}")
 
+    # Top tags of each facet among the games in the report
+    index = get_facet_index()
+    for facet in FACET_COLUMNS:
+        st.write(f"### Top {facet}")
+        for tag, count in list(index.counts(facet, result).items())[:REPORT_TOP_TAGS]:
+            st.write(f"{tag}: {count}")
+
 
 def crash_simulation():
     # Add failure simulation toggle to the sidebar
     st.sidebar.header("Crash Simulation")
-    for node in node_status.keys():
-        node_status[node] = st.sidebar.checkbox(node, value=True)
+    monitor = get_health_monitor()
+    for node in NODE_CONNECTION_KEYS:
+        # Read back through node_available(); the override only applies to this session
+        st.sidebar.checkbox(node, value=True, key=f"node_enabled_{node}")
+        if monitor.state(node) != CIRCUIT_CLOSED:
+            st.sidebar.caption(f"{node} circuit is {monitor.state(node)} (no heartbeat)")
     st.sidebar.checkbox("Simulate Failure in Node 1 Replication", key="simulate_failure_node_1")
     st.sidebar.checkbox("Simulate Failure in Node 2 or 3 Replication", key="simulate_failure_node_2or3")
 
@@ -713,7 +1676,7 @@ def main():
     # Add crash simulation options to the sidebar
     crash_simulation()
 
-    page = st.sidebar.radio("Select Operation", ["Show", "Search", "Insert", "Update", "Delete", "Report"])
+    page = st.sidebar.radio("Select Operation", ["Show", "Search", "Insert", "Update", "Delete", "Bulk", "Report"])
 
     # Initialize or retain first selected node
     if 'first_selected_node' not in st.session_state:
@@ -721,15 +1684,15 @@ def main():
 
     if page == "Insert":
         # Detect the first node click based on the checkbox states
-        if node_status["Node 1"] and st.session_state.first_selected_node is None:
+        if node_available("Node 1") and st.session_state.first_selected_node is None:
             st.session_state.first_selected_node = "Node 1"
             print("Node 1 is first clicked")
 
-        elif node_status["Node 2"] and st.session_state.first_selected_node is None:
+        elif node_available("Node 2") and st.session_state.first_selected_node is None:
             st.session_state.first_selected_node = "Node 2"
             print("Node 2 is first clicked")
 
-        elif node_status["Node 3"] and st.session_state.first_selected_node is None:
+        elif node_available("Node 3") and st.session_state.first_selected_node is None:
             st.session_state.first_selected_node = "Node 3"
             print("Node 3 is first clicked")
 
@@ -739,6 +1702,8 @@ def main():
         update()
     elif page == "Delete":
         delete()
+    elif page == "Bulk":
+        bulk()
     elif page == "Show":
         show()
     elif page == "Search":
@@ -748,11 +1713,11 @@ def main():
 
     # Adjust the backup node based on the first selected node
     
-    if st.session_state.first_selected_node == "Node 1" and (node_status["Node 2"] == True or node_status["Node 3"] == True):
+    if st.session_state.first_selected_node == "Node 1" and (node_available("Node 2") == True or node_available("Node 3") == True):
         replicate_from_temp_logs_to_backup_node()
-    elif st.session_state.first_selected_node == "Node 1" and (node_status["Node 2"] == True and node_status["Node 3"] == True):
+    elif st.session_state.first_selected_node == "Node 1" and (node_available("Node 2") == True and node_available("Node 3") == True):
         return
-    elif (st.session_state.first_selected_node == "Node 2" or st.session_state.first_selected_node ==  "Node 3") and node_status["Node 1"] == True:
+    elif (st.session_state.first_selected_node == "Node 2" or st.session_state.first_selected_node ==  "Node 3") and node_available("Node 1") == True:
         replicate_from_temp_logs_to_node_1()
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+"""app.py is imported against a minimal streamlit stub so its helpers can be unit tested."""
+import os
+import sys
+import types
+
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+
+class CacheStub:
+    # Stands in for st.cache_data / st.cache_resource, with or without arguments
+    def __call__(self, *args, **kwargs):
+        if args and callable(args[0]):
+            return self._wrap(args[0])
+        return self._wrap
+
+    def _wrap(self, func):
+        func.clear = lambda: None
+        return func
+
+
+class StreamlitStub(types.ModuleType):
+    def __getattr__(self, name):
+        # Page elements (st.info, st.warning, ...) render nothing in tests
+        return lambda *args, **kwargs: None
+
+
+streamlit = StreamlitStub("streamlit")
+streamlit.cache_data = CacheStub()
+streamlit.cache_resource = CacheStub()
+streamlit.session_state = {}
+streamlit.secrets = {}
+sys.modules["streamlit"] = streamlit
+
+
+@pytest.fixture(autouse=True)
+def session_state():
+    streamlit.session_state.clear()
+    yield streamlit.session_state
+    streamlit.session_state.clear()
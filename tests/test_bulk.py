@@ -0,0 +1,128 @@
+import sqlite3
+from datetime import date
+
+import pytest
+
+import app
+
+sqlite3.register_adapter(date, date.isoformat)
+
+GAMES = [
+    (1, "Half-Life", date(2005, 1, 1), "Valve", "Action"),
+    (2, "Dota 2", date(2015, 1, 1), "Valve", "Strategy"),
+    (3, "Mass Effect", date(2008, 1, 1), "EA", "RPG"),
+    (4, "Portal 2", date(2010, 5, 1), "Valve", "Puzzle"),
+    (5, "Cogs", date(2011, 3, 1), "100%_Games", "Puzzle"),
+    (6, "Gears", date(2012, 3, 1), "100 Games", "Puzzle"),
+]
+
+
+class FakeCursor:
+    # Runs the app's MySQL-style queries against an in-memory sqlite database
+    def __init__(self, conn):
+        self._cursor = conn.cursor()
+        self.rowcount = 0
+
+    def execute(self, query, params=()):
+        self._cursor.execute(query.replace("%s", "?"), list(params))
+        self.rowcount = self._cursor.rowcount
+
+    def fetchall(self):
+        return [tuple(self._parse(value) for value in row) for row in self._cursor.fetchall()]
+
+    @staticmethod
+    def _parse(value):
+        if isinstance(value, str) and len(value) == 10 and value[4] == "-":
+            return date.fromisoformat(value)
+        return value
+
+
+def game_row(game_id, name, release_date, publisher, genre):
+    return (game_id, name, release_date, 0, 9.99, 1, 0, 0, "English", "Dev", publisher, genre)
+
+
+@pytest.fixture
+def nodes(monkeypatch):
+    # Node 1 holds every game; Node 2 and Node 3 hold their partition (2010 sits on Node 2)
+    databases = {}
+    for node in app.LOG_NODES:
+        conn = sqlite3.connect(":memory:")
+        conn.execute(f"CREATE TABLE games ({', '.join(app.GAME_COLUMNS)})")
+        databases[node] = conn
+    for game in GAMES:
+        row = game_row(*game)
+        for node in ("Node 1", "Node 2" if game[2].year <= 2010 else "Node 3"):
+            databases[node].execute(f"INSERT INTO games VALUES ({', '.join(['?'] * len(row))})", row)
+
+    available = dict.fromkeys(app.LOG_NODES, True)
+    logged = []
+    monkeypatch.setattr(app, "get_cursor", lambda node: FakeCursor(databases[node]))
+    monkeypatch.setattr(app, "get_connection", lambda node: databases[node])
+    monkeypatch.setattr(app, "node_available", lambda node: available[node])
+    monkeypatch.setattr(app, "log_transaction", lambda action, node, query, params: logged.append((action, node)))
+    return databases, available, logged
+
+
+def ids_on(conn):
+    return sorted(game_id for (game_id,) in conn.execute("SELECT game_id FROM games"))
+
+
+def test_predicate_combines_every_filter():
+    where, params = app.build_bulk_predicate("Valve", "RPG", date(2000, 1, 1), date(2010, 12, 31), [1, 2])
+    assert where == (
+        "publishers LIKE %s ESCAPE '!' AND genres LIKE %s ESCAPE '!' AND "
+        "release_date >= %s AND release_date <= %s AND game_id IN (%s, %s)"
+    )
+    assert params == ["%Valve%", "%RPG%", date(2000, 1, 1), date(2010, 12, 31), 1, 2]
+
+
+def test_predicate_escapes_like_wildcards():
+    _, params = app.build_bulk_predicate("100%_!", None, None, None, [])
+    assert params == ["%100!%!_!!%"]
+
+
+def test_wildcards_in_a_filter_match_literally(nodes):
+    where, params = app.build_bulk_predicate("100%_", None, None, None, [])
+    assert app.select_bulk_targets(where, params) == {"Node 1": [5], "Node 3": [5]}
+
+
+def test_targets_come_from_the_partition_that_holds_each_row(nodes):
+    where, params = app.build_bulk_predicate("Valve", None, None, None, [])
+    targets = app.select_bulk_targets(where, params)
+    assert sorted(targets["Node 1"]) == [1, 2, 4]
+    assert sorted(targets["Node 2"]) == [1, 4]
+    assert targets["Node 3"] == [2]
+
+
+def test_rows_of_a_down_partition_are_inferred_from_node_1(nodes):
+    _, available, _ = nodes
+    available["Node 2"] = False
+    where, params = app.build_bulk_predicate("Valve", None, None, None, [])
+    targets = app.select_bulk_targets(where, params)
+    assert sorted(targets["Node 2"]) == [1, 4]
+    assert targets["Node 3"] == [2]
+
+
+def test_release_date_change_moves_rows_to_the_other_partition(nodes):
+    databases, _, logged = nodes
+    where, params = app.build_bulk_predicate("Valve", None, None, date(2010, 12, 31), [])
+    targets = app.select_bulk_targets(where, params)
+    app.bulk_update(targets, {"price": 1.0, "release_date": date(2012, 2, 2)})
+
+    assert ids_on(databases["Node 2"]) == [3]
+    assert ids_on(databases["Node 3"]) == [1, 2, 4, 5, 6]
+    moved = databases["Node 3"].execute("SELECT price, release_date FROM games WHERE game_id IN (1, 4)").fetchall()
+    assert moved == [(1.0, "2012-02-02"), (1.0, "2012-02-02")]
+    assert ("INSERT", "Node 3") in logged and ("DELETE", "Node 2") in logged
+
+
+def test_statements_for_a_down_node_are_logged_for_replay(nodes):
+    databases, available, logged = nodes
+    available["Node 3"] = False
+    where, params = app.build_bulk_predicate(None, "Puzzle", None, None, [])
+    app.bulk_delete(app.select_bulk_targets(where, params))
+
+    assert ids_on(databases["Node 1"]) == [1, 2, 3]
+    assert ids_on(databases["Node 2"]) == [1, 3]
+    assert ids_on(databases["Node 3"]) == [2, 5, 6]
+    assert ("DELETE_TEMP", "Node 3") in logged
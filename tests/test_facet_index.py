@@ -0,0 +1,106 @@
+import random
+
+import app
+
+LANGUAGES = ["English", "French", "German", "Japanese"]
+GENRES = ["Action", "RPG", "Puzzle", "Strategy", "Indie"]
+PUBLISHERS = ["Valve", "EA", "Ubisoft"]
+
+
+def random_game(rng, game_id):
+    return {
+        "game_id": game_id,
+        "languages": str(rng.sample(LANGUAGES, rng.randint(0, 3))),
+        "developers": rng.choice(["Dev A", "Dev B", "Dev A, Dev B", None]),
+        "publishers": rng.choice(PUBLISHERS),
+        "genres": ", ".join(rng.sample(GENRES, rng.randint(1, 3))),
+        "windows": rng.randint(0, 1),
+        "mac": rng.randint(0, 1),
+        "linux": rng.randint(0, 1),
+    }
+
+
+def game_tags(game, facet):
+    if facet == "Platforms":
+        return {platform for platform, column in app.PLATFORM_COLUMNS.items() if game[column] == 1}
+    return set(app.tokenize_tags(game[app.FACET_COLUMNS[facet]]))
+
+
+def brute_force_match(games, selected, match_all):
+    matches = []
+    for game_id, game in games.items():
+        ok = True
+        for facet, tags in selected.items():
+            if not tags:
+                continue
+            held = [tag in game_tags(game, facet) for tag in tags]
+            ok = ok and (all(held) if match_all else any(held))
+        if ok:
+            matches.append(game_id)
+    return sorted(matches)
+
+
+def brute_force_counts(games, game_ids, facet):
+    counts = {}
+    for game_id in game_ids:
+        for tag in game_tags(games[game_id], facet):
+            counts[tag] = counts.get(tag, 0) + 1
+    return counts
+
+
+def random_selection(rng):
+    choices = {
+        "Languages": LANGUAGES,
+        "Genres": GENRES,
+        "Publishers": PUBLISHERS,
+        "Platforms": list(app.PLATFORM_COLUMNS),
+    }
+    return {facet: rng.sample(tags, rng.randint(0, 2)) for facet, tags in choices.items()}
+
+
+def test_index_agrees_with_a_brute_force_filter():
+    rng = random.Random(7)
+    index = app.FacetIndex()
+    games = {}
+    for step in range(600):
+        game_id = rng.randint(1, 120)
+        if game_id in games and rng.random() < 0.3:
+            index.remove(game_id)
+            del games[game_id]
+        else:
+            games[game_id] = random_game(rng, game_id)
+            index.add(games[game_id])
+
+        if step % 20:
+            continue
+        assert index.covers(set(games))
+        for match_all in (False, True):
+            selected = random_selection(rng)
+            result = index.match(selected, match_all)
+            expected = brute_force_match(games, selected, match_all)
+            assert sorted(index.game_ids(result)) == expected
+            for facet in app.FACETS:
+                assert index.counts(facet, result) == brute_force_counts(games, expected, facet)
+
+
+def test_update_keeps_the_document_number():
+    rng = random.Random(3)
+    index = app.FacetIndex()
+    for game_id in range(1, 51):
+        index.add(random_game(rng, game_id))
+    for _ in range(500):
+        index.add(random_game(rng, rng.randint(1, 50)))
+    assert len(index._game_ids) == 50
+    assert not index.fragmented()
+
+
+def test_removals_mark_the_index_for_rebuild():
+    rng = random.Random(5)
+    index = app.FacetIndex()
+    for game_id in range(1, 101):
+        index.add(random_game(rng, game_id))
+    for game_id in range(1, 26):
+        index.remove(game_id)
+    assert not index.fragmented()
+    index.remove(26)
+    assert index.fragmented()
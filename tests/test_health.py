@@ -0,0 +1,60 @@
+import app
+
+
+def test_detector_suspects_a_node_after_missed_heartbeats():
+    detector = app.FailureDetector(timeout=3.0)
+    detector.heartbeat(100.0)
+    assert not detector.is_suspected(103.0)
+    assert detector.is_suspected(103.5)
+    detector.heartbeat(103.5)
+    assert not detector.is_suspected(104.0)
+
+
+def test_breaker_opens_on_failure():
+    breaker = app.CircuitBreaker(cooldown=10.0)
+    assert breaker.allow_request()
+    breaker.record_failure(100.0)
+    assert breaker.state == app.CIRCUIT_OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_half_opens_only_after_cooldown():
+    breaker = app.CircuitBreaker(cooldown=10.0)
+    breaker.record_failure(100.0)
+    breaker.try_half_open(105.0)
+    assert breaker.state == app.CIRCUIT_OPEN
+    breaker.try_half_open(110.0)
+    assert breaker.state == app.CIRCUIT_HALF_OPEN
+    assert not breaker.allow_request()
+
+
+def test_successful_probe_closes_the_breaker():
+    breaker = app.CircuitBreaker(cooldown=10.0)
+    breaker.record_failure(100.0)
+    breaker.try_half_open(110.0)
+    breaker.record_success()
+    assert breaker.state == app.CIRCUIT_CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens_and_restarts_the_cooldown():
+    breaker = app.CircuitBreaker(cooldown=10.0)
+    breaker.record_failure(100.0)
+    breaker.try_half_open(110.0)
+    breaker.record_failure(110.0)
+    assert breaker.state == app.CIRCUIT_OPEN
+    breaker.try_half_open(115.0)
+    assert breaker.state == app.CIRCUIT_OPEN
+    breaker.try_half_open(120.0)
+    assert breaker.state == app.CIRCUIT_HALF_OPEN
+
+
+def test_every_failure_bumps_the_generation():
+    breaker = app.CircuitBreaker(cooldown=10.0)
+    assert breaker.generation == 0
+    breaker.record_failure(100.0)
+    breaker.record_failure(101.0)
+    assert breaker.generation == 2
+    breaker.try_half_open(111.0)
+    breaker.record_success()
+    assert breaker.generation == 2
@@ -0,0 +1,100 @@
+"""Cold-start budget for app.py.
+
+Streamlit re-runs the script on every interaction, so importing it must not
+touch the database or load the heavy dependencies. The import runs in a
+fresh interpreter with a minimal streamlit stub so the result does not
+depend on what other tests have already imported.
+"""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET = 0.5  # Seconds allowed for importing app.py, page config included
+HEAVY_MODULES = ("mysql", "mysql.connector", "pandas", "st_aggrid")
+
+STARTUP_SCRIPT = textwrap.dedent("""
+    import json
+    import sys
+    import time
+    import types
+
+    heavy = set(json.loads(sys.argv[1]))
+    attempted = []
+    events = []
+
+    class RecordHeavyImports:
+        def find_spec(self, name, path=None, target=None):
+            if name in heavy:
+                attempted.append(name)
+            return None
+
+    sys.meta_path.insert(0, RecordHeavyImports())
+
+    class Cache:
+        def __call__(self, *args, **kwargs):
+            if args and callable(args[0]):
+                return self._wrap(args[0])
+            return self._wrap
+
+        def _wrap(self, func):
+            def cached(*args, **kwargs):
+                events.append("cached call: " + func.__name__)
+                return func(*args, **kwargs)
+            cached.clear = lambda: None
+            return cached
+
+    class Secrets:
+        def __getitem__(self, key):
+            events.append("secrets: " + key)
+            raise KeyError(key)
+
+    st = types.ModuleType("streamlit")
+    st.cache_resource = Cache()
+    st.cache_data = Cache()
+    st.secrets = Secrets()
+    st.session_state = {}
+    st.set_page_config = lambda **kwargs: events.append("set_page_config")
+    sys.modules["streamlit"] = st
+
+    start = time.perf_counter()
+    import app
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "elapsed": elapsed,
+        "attempted": attempted,
+        "loaded": sorted(name for name in heavy if name in sys.modules),
+        "events": events,
+    }))
+""")
+
+
+def run_startup():
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT, json.dumps(HEAVY_MODULES)],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_does_not_load_heavy_modules():
+    startup = run_startup()
+    assert startup["attempted"] == []
+    assert startup["loaded"] == []
+
+
+def test_import_does_not_touch_the_database():
+    startup = run_startup()
+    # Reading secrets or calling a cached loader would mean a connection or query at import
+    assert startup["events"] == ["set_page_config"]
+
+
+def test_import_stays_within_budget():
+    startup = run_startup()
+    assert startup["elapsed"] < IMPORT_BUDGET
@@ -0,0 +1,110 @@
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+import app
+
+QUERY = "UPDATE games SET price = %s WHERE game_id = %s"
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "recovery_log.bin")
+
+
+def test_params_round_trip(log_path):
+    params = (7, Decimal("19.99"), 2.5, date(2009, 12, 31), datetime(2012, 5, 6, 7, 8, 9, 10), None, "Café, Ltd.")
+    log = app.TransactionLog(log_path)
+    log.append("UPDATE_TEMP", "Node 2", QUERY, params)
+
+    entries, _ = app.TransactionLog(log_path).read()
+    assert entries == [{"action": "UPDATE_TEMP", "node": "Node 2", "query": QUERY, "params": params}]
+    assert [type(param) for param in entries[0]["params"]] == [type(param) for param in params]
+
+
+def test_statements_are_interned(log_path):
+    log = app.TransactionLog(log_path)
+    log.append("UPDATE", "Node 1", QUERY, (1.0, 1))
+    size = os.path.getsize(log_path)
+    log.append("UPDATE", "Node 1", QUERY, (2.0, 2))
+    assert os.path.getsize(log_path) - size < len(QUERY)
+
+
+def test_corrupt_record_is_yielded_as_none(log_path):
+    log = app.TransactionLog(log_path)
+    log.append("INSERT", "Node 1", QUERY, (1.0, 1))
+    log.append("DELETE", "Node 3", QUERY, (2.0, 2))
+
+    with open(log_path, "r+b") as f:
+        data = bytearray(f.read())
+        data[-1] ^= 0xFF  # Flip a byte in the last record's params
+        f.seek(0)
+        f.write(data)
+
+    entries, _ = app.TransactionLog(log_path).read()
+    assert entries[0]["params"] == (1.0, 1)
+    assert entries[1] is None
+
+
+def test_torn_tail_is_truncated_on_open(log_path):
+    log = app.TransactionLog(log_path)
+    log.append("INSERT", "Node 1", QUERY, (1.0, 1))
+    size = os.path.getsize(log_path)
+    with open(log_path, "ab") as f:
+        f.write(b"\x40\x00\x00\x00\x01\x02")  # Header of a record whose body never made it
+
+    reopened = app.TransactionLog(log_path)
+    assert os.path.getsize(log_path) == size
+    reopened.append("DELETE", "Node 2", QUERY, (2.0, 2))
+    entries, _ = reopened.read()
+    assert [entry["params"] for entry in entries] == [(1.0, 1), (2.0, 2)]
+
+
+def test_rewrite_keeps_records_appended_after_read(log_path):
+    log = app.TransactionLog(log_path)
+    log.append("INSERT_TEMP", "Node 2", QUERY, (1.0, 1))
+    log.append("INSERT_TEMP", "Node 3", QUERY, (2.0, 2))
+    entries, position = log.read()
+
+    log.append("DELETE_TEMP", "Node 2", "DELETE FROM games WHERE game_id = %s", (3,))
+    log.rewrite(entries[1:], position)
+
+    entries, _ = app.TransactionLog(log_path).read()
+    assert [(entry["action"], entry["params"]) for entry in entries] == [
+        ("INSERT_TEMP", (2.0, 2)),
+        ("DELETE_TEMP", (3,)),
+    ]
+
+
+def test_rewrite_rejects_a_stale_snapshot(log_path):
+    log = app.TransactionLog(log_path)
+    log.append("INSERT_TEMP", "Node 2", QUERY, (1.0, 1))
+    entries, position = log.read()
+    log.rewrite([], position)
+
+    with pytest.raises(RuntimeError):
+        log.rewrite(entries, position)
+    assert log.read()[0] == []
+
+
+def test_json_lines_log_is_migrated(log_path, tmp_path):
+    legacy_path = str(tmp_path / "recovery_log.txt")
+    with open(legacy_path, "w") as legacy:
+        legacy.write(json.dumps({
+            "action": "INSERT_TEMP", "node": "Node 2", "query": QUERY,
+            "params": [1, "Game", "2005-01-02", "2005-01-02 03:04:05"],
+        }) + "\n")
+        legacy.write("not json\n")
+    log = app.TransactionLog(log_path)
+    log.append("UPDATE", "Node 1", QUERY, (2.0, 2))
+
+    app.migrate_legacy_log(log, legacy_path)
+
+    entries, _ = log.read()
+    assert entries[0]["params"] == (1, "Game", date(2005, 1, 2), datetime(2005, 1, 2, 3, 4, 5))
+    assert entries[1]["action"] == "UPDATE"
+    assert not os.path.exists(legacy_path)
+    assert os.path.exists(legacy_path + ".migrated")